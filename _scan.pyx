@@ -0,0 +1,113 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Bit-parallel (shift-and) scanning of DNA sequences for IUPAC consensus sequences.
+
+Optional compiled accelerator for part1.py. Build it in place with:
+
+    cythonize -i _scan.pyx
+"""
+from libc.stdint cimport uint64_t
+from libc.stdlib cimport free, realloc
+
+# Longest consensus that fits in the 64-bit shift-and state
+MAX_PATTERN_LENGTH = 64
+
+
+cdef struct PositionBuffer:
+    Py_ssize_t *data
+    Py_ssize_t size
+    Py_ssize_t capacity
+
+
+cdef int append_position(PositionBuffer *buffer, Py_ssize_t position) noexcept nogil:
+    """Append a position to a growable buffer; return -1 if memory runs out."""
+    cdef Py_ssize_t capacity
+    cdef Py_ssize_t *data
+    if buffer.size == buffer.capacity:
+        capacity = buffer.capacity * 2 if buffer.capacity else 64
+        data = <Py_ssize_t *> realloc(buffer.data, capacity * sizeof(Py_ssize_t))
+        if data == NULL:
+            return -1
+        buffer.data = data
+        buffer.capacity = capacity
+    buffer.data[buffer.size] = position
+    buffer.size += 1
+    return 0
+
+
+cdef class ShiftAndScanner:
+    """
+    Shift-and scanner for one consensus sequence on both strands.
+
+    The per-byte bit tables are built once here, so scanning a sequence only
+    runs the shift-and loop.
+
+    Args:
+        base_masks (numpy.ndarray): 256-entry table of 4-bit masks per byte value.
+        forward_masks (numpy.ndarray): 4-bit masks of the consensus.
+        reverse_masks (numpy.ndarray): 4-bit masks of its reverse complement.
+
+    Raises:
+        ValueError: If the consensus is empty or longer than MAX_PATTERN_LENGTH.
+    """
+    cdef uint64_t forward_table[256]
+    cdef uint64_t reverse_table[256]
+    cdef uint64_t last_bit
+    cdef readonly Py_ssize_t length
+
+    def __cinit__(self, const unsigned char[::1] base_masks,
+                  const unsigned char[::1] forward_masks, const unsigned char[::1] reverse_masks):
+        cdef Py_ssize_t byte, j
+        self.length = forward_masks.shape[0]
+        if self.length == 0 or self.length > MAX_PATTERN_LENGTH or reverse_masks.shape[0] != self.length:
+            raise ValueError(f"Consensus length must be between 1 and {MAX_PATTERN_LENGTH}.")
+        if base_masks.shape[0] != 256:
+            raise ValueError("base_masks must have 256 entries.")
+        # For every byte value, set bit j if that base satisfies pattern position j
+        for byte in range(256):
+            self.forward_table[byte] = 0
+            self.reverse_table[byte] = 0
+            for j in range(self.length):
+                if base_masks[byte] & forward_masks[j]:
+                    self.forward_table[byte] |= (<uint64_t> 1) << j
+                if base_masks[byte] & reverse_masks[j]:
+                    self.reverse_table[byte] |= (<uint64_t> 1) << j
+        self.last_bit = (<uint64_t> 1) << (self.length - 1)
+
+    def scan(self, const unsigned char[::1] sequence):
+        """
+        Find the start positions of the consensus on both strands of a sequence.
+
+        Args:
+            sequence (bytes): DNA sequence to search in.
+
+        Returns:
+            tuple: (forward_starts, reverse_starts), lists of 0-based start positions, ascending.
+        """
+        cdef Py_ssize_t n = sequence.shape[0]
+        cdef Py_ssize_t length = self.length
+        cdef Py_ssize_t i
+        cdef uint64_t forward_state = 0, reverse_state = 0
+        cdef uint64_t last_bit = self.last_bit
+        cdef PositionBuffer forward_starts = PositionBuffer(NULL, 0, 0)
+        cdef PositionBuffer reverse_starts = PositionBuffer(NULL, 0, 0)
+        cdef int failed = 0
+
+        try:
+            with nogil:
+                for i in range(n):
+                    forward_state = ((forward_state << 1) | 1) & self.forward_table[sequence[i]]
+                    reverse_state = ((reverse_state << 1) | 1) & self.reverse_table[sequence[i]]
+                    if forward_state & last_bit:
+                        failed |= append_position(&forward_starts, i - length + 1)
+                    if reverse_state & last_bit:
+                        failed |= append_position(&reverse_starts, i - length + 1)
+            if failed:
+                raise MemoryError()
+            return (
+                [forward_starts.data[i] for i in range(forward_starts.size)],
+                [reverse_starts.data[i] for i in range(reverse_starts.size)],
+            )
+        finally:
+            free(forward_starts.data)
+            free(reverse_starts.data)
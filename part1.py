@@ -1,8 +1,30 @@
 import argparse
+import mmap
+import os
 import re
-from Bio.Seq import Seq
-from Bio.SeqRecord import SeqRecord
+import stat
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice, product
+import numpy as np
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from _scan import MAX_PATTERN_LENGTH, ShiftAndScanner
+except ImportError:
+    ShiftAndScanner = None
+    MAX_PATTERN_LENGTH = 64
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -22,52 +44,246 @@ Extract transcription factor binding sites (TFBS) from DNA sequences based on IU
 
 # Map IUPAC consensus codes to possible bases
 IUPAC_CODES = {
-    'A': 'A', 'C': 'C', 'G': 'G', 'T': 'T',
-    'R': '[AG]', 'Y': '[CT]', 'S': '[GC]', 'W': '[AT]',
-    'K': '[GT]', 'M': '[AC]', 'B': '[CGT]', 'D': '[AGT]',
-    'H': '[ACT]', 'V': '[ACG]', 'N': '[ACGT]'
+    'A': b'A', 'C': b'C', 'G': b'G', 'T': b'T',
+    'R': b'[AG]', 'Y': b'[CT]', 'S': b'[GC]', 'W': b'[AT]',
+    'K': b'[GT]', 'M': b'[AC]', 'B': b'[CGT]', 'D': b'[AGT]',
+    'H': b'[ACT]', 'V': b'[ACG]', 'N': b'[ACGT]'
 }
 
-def parse_fasta(fasta_file):
+# IUPAC_CODES indexed by byte value; None marks an invalid base
+IUPAC_TABLE = [IUPAC_CODES.get(chr(byte)) for byte in range(256)]
+
+# Complement of every IUPAC code (upper and lower case) for bytes.translate
+COMPLEMENT_TABLE = bytes.maketrans(
+    b'ACGTRYSWKMBDHVNacgtryswkmbdhvn',
+    b'TGCAYRSWMKVHDBNtgcayrswmkvhdbn'
+)
+
+# 4-bit masks for A, C, G and T; any other sequence byte maps to 0 and never matches
+BASE_MASKS = np.zeros(256, dtype=np.uint8)
+BASE_MASKS[list(b'ACGT')] = (1, 2, 4, 8)
+
+# Below this length NumPy call overhead outweighs the vectorized scan
+BITMASK_MIN_LENGTH = 4096
+
+# Sequence length from which the compiled shift-and scanner is used instead of the regex
+SHIFT_AND_MIN_LENGTH = 32
+
+# Upper bound on explicit sites (all consensus sequences, both strands) loaded into an Aho-Corasick automaton
+MAX_EXPANDED_SITES = 1 << 18
+
+# Number of FASTA records sent to a worker process per task
+SCAN_BATCH_SIZE = 16
+
+# Read FASTA input in 1 MiB blocks rather than the 8 KiB default
+READ_BUFFER_SIZE = 1 << 20
+
+# Buffer result lines in 1 MiB before they are flushed to the output file
+WRITE_BUFFER_SIZE = 1 << 20
+
+def _iter_mapped_records(file):
     """
-    Parse a FASTA file and return a dictionary of sequences.
+    Yield FASTA records from a regular file through a read-only memory map.
+
+    Record boundaries are located with find() on the mapping. Each record body
+    is sliced out of the mapping and its line breaks are then removed with
+    translate(), so peak memory is about twice the longest record.
+    """
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if mapped[:1] != b'>':
+            logging.error("Malformed FASTA: Sequence data without header.")
+            raise ValueError("Malformed FASTA file.")
+        size = len(mapped)
+        start = 0
+        while start < size:
+            header_end = mapped.find(b'\n', start)
+            if header_end == -1:
+                header_end = size
+            record_end = mapped.find(b'\n>', header_end)
+            if record_end == -1:
+                record_end = size
+            name = mapped[start + 1:header_end].rstrip(b'\r').decode()
+            yield name, mapped[header_end:record_end].translate(None, b'\r\n')
+            start = record_end + 1
+
+def _iter_line_records(file):
+    """
+    Yield FASTA records from a file object line by line.
+
+    Used for streams such as pipes that cannot be memory-mapped.
+    """
+    current_seq_name = None
+    current_chunks = None
+    for line in file:
+        line = line.rstrip(b'\r\n')
+        if line.startswith(b'>'):
+            if current_chunks is not None:
+                yield current_seq_name, b"".join(current_chunks)
+            current_seq_name = line[1:].decode()
+            # Collect lines in a list and join once; repeated += copies the whole sequence
+            current_chunks = []
+        elif current_chunks is not None:
+            current_chunks.append(line)
+        else:
+            logging.error("Malformed FASTA: Sequence data without header.")
+            raise ValueError("Malformed FASTA file.")
+    if current_chunks is not None:
+        yield current_seq_name, b"".join(current_chunks)
+
+def iter_fasta(fasta_file):
+    """
+    Iterate over a FASTA file, yielding one (name, sequence) record at a time.
+
+    Only the record being read is held in memory, so large files can be
+    processed without loading every sequence first. Regular files are
+    memory-mapped; other inputs are read in binary mode with a large buffer.
+    Names are decoded to str while sequences are returned as bytes.
     """
-    sequences = {}
     try:
-        with open(fasta_file, 'r') as file:
-            current_seq_name = None
-            for line in file:
-                line = line.strip()
-                if line.startswith('>'):
-                    current_seq_name = line[1:]
-                    sequences[current_seq_name] = ""
-                elif current_seq_name:
-                    sequences[current_seq_name] += line
-                else:
-                    logging.error("Malformed FASTA: Sequence data without header.")
-                    raise ValueError("Malformed FASTA file.")
-        if not sequences:
-            logging.warning("The input FASTA file is empty.")
+        with open(fasta_file, 'rb', buffering=READ_BUFFER_SIZE) as file:
+            file_stat = os.fstat(file.fileno())
+            # Empty files cannot be mapped, so they take the line-based path
+            if stat.S_ISREG(file_stat.st_mode) and file_stat.st_size > 0:
+                records = _iter_mapped_records(file)
+            else:
+                records = _iter_line_records(file)
+            is_empty = True
+            for record in records:
+                is_empty = False
+                yield record
+            if is_empty:
+                logging.warning("The input FASTA file is empty.")
     except FileNotFoundError:
         logging.error(f"File {fasta_file} not found.")
         raise
     except Exception as e:
         logging.error(f"Error while parsing the FASTA file: {e}")
         raise
-    return sequences
+
+def parse_fasta(fasta_file):
+    """
+    Parse a FASTA file and return a dictionary of sequences (as bytes).
+    """
+    return dict(iter_fasta(fasta_file))
+
+def reverse_complement(sequence):
+    """
+    Return the reverse complement of a DNA sequence.
+
+    Args:
+        sequence (bytes): DNA sequence, possibly containing IUPAC codes.
+
+    Returns:
+        bytes: Reverse complement of the sequence.
+    """
+    return sequence.translate(COMPLEMENT_TABLE)[::-1]
+
+def _consensus_classes(consensus):
+    """
+    Validate an IUPAC consensus sequence and map each base to its regex class in one pass.
+
+    Raises:
+        ValueError: If the sequence contains invalid characters.
+    """
+    classes = [IUPAC_TABLE[byte] for byte in consensus.encode()]
+    if None in classes:
+        base = next(base for base in consensus if base not in IUPAC_CODES)
+        logging.error(f"Invalid base '{base}' in consensus sequence.")
+        raise ValueError(f"Invalid base '{base}' in consensus sequence.")
+    return classes
+
+def consensus_to_regex(consensus):
+    """
+    Translate an IUPAC consensus sequence into an uncompiled bytes regex.
+
+    Args:
+        consensus (str): Consensus sequence in IUPAC notation.
+
+    Returns:
+        bytes: Regex source with one character class per consensus position.
+
+    Raises:
+        ValueError: If the sequence contains invalid characters.
+    """
+    return b''.join(_consensus_classes(consensus))
 
 def build_regex_from_consensus(consensus):
     """
     Convert an IUPAC consensus sequence into a regex pattern.
 
+    The pattern is wrapped in a zero-width lookahead so that finditer reports
+    overlapping sites; group 1 captures the matched site.
+
+    Args:
+        consensus (str): Consensus sequence in IUPAC notation.
+
+    Returns:
+        re.Pattern: Compiled bytes regex pattern corresponding to the consensus sequence.
+    """
+    regex_pattern = consensus_to_regex(consensus)
+    return re.compile(b'(?=(' + regex_pattern + b'))')
+
+def build_stranded_regex(consensus):
+    """
+    Convert an IUPAC consensus sequence into a regex that finds sites on both strands.
+
+    A reverse-strand site is matched on the forward sequence through the reverse
+    complement of the consensus, so the sequence is scanned once and never
+    reverse-complemented. The pattern is zero-width; group 1 captures a forward
+    site and group 2 a reverse-strand site at the same position (both are set
+    for palindromic sites).
+
     Args:
         consensus (str): Consensus sequence in IUPAC notation.
 
     Returns:
-        re.Pattern: Compiled regex pattern corresponding to the consensus sequence.
+        re.Pattern: Compiled bytes regex pattern for both strands.
+    """
+    forward = consensus_to_regex(consensus)
+    reverse = consensus_to_regex(reverse_complement(consensus.encode()).decode())
+    return re.compile(b'(?=%s|%s)(?=(%s)?)(?=(%s)?)' % (forward, reverse, forward, reverse))
+
+def build_hyperscan_database(consensus):
     """
-    regex_pattern = ''.join(IUPAC_CODES[base] for base in consensus)
-    return re.compile(regex_pattern)
+    Compile an IUPAC consensus sequence into a Hyperscan database for both strands.
+
+    Expression id 0 matches forward-strand sites and id 1 reverse-strand sites
+    (the reverse complement of the consensus on the forward sequence).
+
+    Args:
+        consensus (str): Consensus sequence in IUPAC notation.
+
+    Returns:
+        hyperscan.Database: Compiled block-mode database.
+    """
+    forward = consensus_to_regex(consensus)
+    reverse = consensus_to_regex(reverse_complement(consensus.encode()).decode())
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[forward, reverse],
+        ids=[0, 1],
+        elements=2,
+        flags=[hyperscan.HS_FLAG_ALLOWEMPTY] * 2
+    )
+    return database
+
+def consensus_to_masks(consensus):
+    """
+    Encode an IUPAC consensus sequence as one 4-bit base mask per position.
+
+    Args:
+        consensus (str): Consensus sequence in IUPAC notation.
+
+    Returns:
+        numpy.ndarray: uint8 array of masks built from BASE_MASKS.
+
+    Raises:
+        ValueError: If the sequence contains invalid characters.
+    """
+    return np.array(
+        [np.bitwise_or.reduce(BASE_MASKS[list(bases)]) for bases in _consensus_classes(consensus)],
+        dtype=np.uint8
+    )
 
 def validate_consensus(consensus):
     """
@@ -79,76 +295,447 @@ def validate_consensus(consensus):
     Raises:
         ValueError: If the sequence contains invalid characters.
     """
-    for base in consensus:
-        if base not in IUPAC_CODES:
-            logging.error(f"Invalid base '{base}' in consensus sequence.")
-            raise ValueError(f"Invalid base '{base}' in consensus sequence.")
+    _consensus_classes(consensus)
 
 def find_overlapping_matches(sequence, pattern):
     """
     Find all matches of a regex pattern in a given DNA sequence, including overlapping matches.
 
     Args:
-        sequence (str): DNA sequence to search in.
-        pattern (re.Pattern): Compiled regex pattern.
+        sequence (bytes): DNA sequence to search in.
+        pattern (re.Pattern): Compiled pattern from build_regex_from_consensus.
+
+    Returns:
+        list: List of matched TFBS sequences.
+    """
+    return [match.group(1) for match in pattern.finditer(sequence)]
+
+def find_stranded_matches(sequence, pattern):
+    """
+    Find all matches on both strands of a DNA sequence, including overlapping matches.
+
+    Forward-strand sites are listed first, in order along the sequence, followed
+    by reverse-strand sites as read on the reverse strand.
+
+    Args:
+        sequence (bytes): DNA sequence to search in.
+        pattern (re.Pattern): Compiled pattern from build_stranded_regex.
 
     Returns:
-        list: List of starting positions (0-based) of all matches.
+        list: List of matched TFBS sequences.
     """
     matches = []
-    start = 0
-    while start < len(sequence):
-        match = pattern.search(sequence, start)
-        if not match:
-            break
-        matches.append(sequence[match.start():match.end()])
-        start = match.start() + 1  # Allow overlap by moving start forward by one
+    reverse_matches = []
+    for forward_site, reverse_site in map(re.Match.groups, pattern.finditer(sequence)):
+        if forward_site is not None:
+            matches.append(forward_site)
+        if reverse_site is not None:
+            reverse_matches.append(reverse_site)
+    # Reverse-strand sites are reported in reverse-strand order
+    matches += [reverse_complement(site) for site in reversed(reverse_matches)]
     return matches
 
-def process_fasta_file(input_fasta, consensus, output_file, delimiter):
+def sites_from_starts(sequence, length, forward_starts, reverse_starts):
+    """
+    Extract TFBS sequences from the start positions of forward and reverse-strand sites.
+
+    Forward-strand sites are listed first, followed by reverse-strand sites
+    reverse-complemented and in reverse-strand order, as in find_stranded_matches.
+
+    Args:
+        sequence (bytes): DNA sequence that was searched.
+        length (int): Length of the consensus sequence.
+        forward_starts (list): Ascending start positions of forward-strand sites.
+        reverse_starts (list): Ascending start positions of reverse-strand sites.
+
+    Returns:
+        list: List of matched TFBS sequences.
+    """
+    matches = [sequence[start:start + length] for start in forward_starts]
+    matches += [reverse_complement(sequence[start:start + length]) for start in reversed(reverse_starts)]
+    return matches
+
+def find_hyperscan_matches(sequence, database, length):
+    """
+    Find all matches on both strands of a DNA sequence using Hyperscan.
+
+    Hyperscan reports every match end offset, so overlapping sites need no
+    special handling. Sites have a fixed length, so start-of-match tracking is
+    not requested from Hyperscan; the start is derived from the end offset.
+    Results are ordered as in find_stranded_matches.
+
+    Args:
+        sequence (bytes): DNA sequence to search in.
+        database (hyperscan.Database): Database from build_hyperscan_database.
+        length (int): Length of the consensus sequence.
+
+    Returns:
+        list: List of matched TFBS sequences.
+    """
+    starts = ([], [])
+
+    def on_match(strand, start, end, flags, context):
+        starts[strand].append(end - length)
+
+    database.scan(sequence, match_event_handler=on_match)
+    return sites_from_starts(sequence, length, *starts)
+
+def find_bitmask_starts(sequence_masks, pattern_masks):
+    """
+    Find the start positions where a masked pattern matches a masked sequence.
+
+    Each pattern column is ANDed against a shifted view of the sequence, so the
+    scan is a handful of vectorized passes and uses O(len(sequence)) memory.
+
+    Args:
+        sequence_masks (numpy.ndarray): Sequence encoded with BASE_MASKS.
+        pattern_masks (numpy.ndarray): Pattern from consensus_to_masks.
+
+    Returns:
+        numpy.ndarray: Start positions (0-based) of all matches, ascending.
+    """
+    n = len(sequence_masks) - len(pattern_masks) + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    hits = np.ones(n, dtype=bool)
+    for offset, mask in enumerate(pattern_masks):
+        hits &= (sequence_masks[offset:offset + n] & mask) != 0
+    return np.flatnonzero(hits)
+
+def find_bitmask_matches(sequence, forward_masks, reverse_masks):
+    """
+    Find all matches on both strands of a DNA sequence with a NumPy bitmask scan.
+
+    Results are ordered as in find_stranded_matches.
+
+    Args:
+        sequence (bytes): DNA sequence to search in.
+        forward_masks (numpy.ndarray): Masks for the consensus.
+        reverse_masks (numpy.ndarray): Masks for the reverse complement of the consensus.
+
+    Returns:
+        list: List of matched TFBS sequences.
+    """
+    sequence_masks = BASE_MASKS[np.frombuffer(sequence, dtype=np.uint8)]
+    forward_starts = find_bitmask_starts(sequence_masks, forward_masks)
+    reverse_starts = find_bitmask_starts(sequence_masks, reverse_masks)
+    return sites_from_starts(sequence, len(forward_masks), forward_starts.tolist(), reverse_starts.tolist())
+
+def find_shift_and_matches(sequence, scanner):
+    """
+    Find all matches on both strands of a DNA sequence with the compiled shift-and scanner.
+
+    Requires the optional _scan extension. Results are ordered as in
+    find_stranded_matches.
+
+    Args:
+        sequence (bytes): DNA sequence to search in.
+        scanner (_scan.ShiftAndScanner): Scanner built for the consensus.
+
+    Returns:
+        list: List of matched TFBS sequences.
+    """
+    forward_starts, reverse_starts = scanner.scan(sequence)
+    return sites_from_starts(sequence, scanner.length, forward_starts, reverse_starts)
+
+def build_matcher(consensus):
+    """
+    Build a function that returns the TFBS found on both strands of a sequence.
+
+    Hyperscan is used when it is installed. Otherwise sequences shorter than
+    SHIFT_AND_MIN_LENGTH bases are scanned with the regex engine, and longer
+    ones with the compiled _scan extension for consensus sequences of up to
+    MAX_PATTERN_LENGTH bases, or else with NumPy bitmasks from
+    BITMASK_MIN_LENGTH bases on.
+
+    Args:
+        consensus (str): Consensus sequence in IUPAC notation.
+
+    Returns:
+        callable: Function taking a sequence (bytes) and returning a list of matched TFBS sequences.
+    """
+    if hyperscan is not None:
+        database = build_hyperscan_database(consensus)
+        return partial(find_hyperscan_matches, database=database, length=len(consensus))
+    forward_masks = consensus_to_masks(consensus)
+    reverse_masks = consensus_to_masks(reverse_complement(consensus.encode()).decode())
+    pattern = build_stranded_regex(consensus)
+    if ShiftAndScanner is not None and 0 < len(consensus) <= MAX_PATTERN_LENGTH:
+        scanner = ShiftAndScanner(BASE_MASKS, forward_masks, reverse_masks)
+
+        def find_matches(sequence):
+            if len(sequence) < SHIFT_AND_MIN_LENGTH:
+                return find_stranded_matches(sequence, pattern)
+            return find_shift_and_matches(sequence, scanner)
+
+        return find_matches
+
+    def find_matches(sequence):
+        if len(sequence) < BITMASK_MIN_LENGTH:
+            return find_stranded_matches(sequence, pattern)
+        return find_bitmask_matches(sequence, forward_masks, reverse_masks)
+
+    return find_matches
+
+def expand_consensus(consensus):
+    """
+    Expand an IUPAC consensus sequence into every explicit A/C/G/T site it matches.
+
+    Args:
+        consensus (str): Consensus sequence in IUPAC notation.
+
+    Returns:
+        list: List of explicit sites (str), e.g. 'RA' -> ['AA', 'GA'].
+    """
+    bases = [regex_class.strip(b'[]').decode() for regex_class in _consensus_classes(consensus)]
+    return [''.join(site) for site in product(*bases)]
+
+def count_expanded_sites(consensus):
+    """
+    Count the explicit sites expand_consensus would return, without expanding.
+    """
+    count = 1
+    for regex_class in _consensus_classes(consensus):
+        count *= len(regex_class.strip(b'[]'))
+    return count
+
+def build_aho_corasick_automaton(consensi):
+    """
+    Load the explicit sites of several consensus sequences, on both strands, into one automaton.
+
+    Each key maps to (site length, ((consensus index, strand), ...)), where
+    strand is 0 for forward and 1 for reverse-strand sites. A site shared by
+    several consensus sequences or strands is stored once.
+
+    Args:
+        consensi (list): Consensus sequences in IUPAC notation.
+
+    Returns:
+        ahocorasick.Automaton: Automaton ready for iter().
+    """
+    owners = {}
+    for index, consensus in enumerate(consensi):
+        reverse = reverse_complement(consensus.encode()).decode()
+        for strand, strand_consensus in enumerate((consensus, reverse)):
+            for site in expand_consensus(strand_consensus):
+                owners.setdefault(site, []).append((index, strand))
+    automaton = ahocorasick.Automaton()
+    for site, site_owners in owners.items():
+        automaton.add_word(site, (len(site), tuple(site_owners)))
+    automaton.make_automaton()
+    return automaton
+
+def find_aho_corasick_matches(sequence, automaton, lengths):
+    """
+    Find all matches of several consensus sequences on both strands in one Aho-Corasick pass.
+
+    Results are grouped by consensus sequence, in input order, and each group
+    is ordered as in find_stranded_matches.
+
+    Args:
+        sequence (bytes): DNA sequence to search in.
+        automaton (ahocorasick.Automaton): Automaton from build_aho_corasick_automaton.
+        lengths (list): Length of each consensus sequence.
+
+    Returns:
+        list: List of matched TFBS sequences.
+    """
+    starts = [([], []) for _ in lengths]
+    # pyahocorasick matches str keys; latin-1 maps each byte to one character
+    for end, (length, site_owners) in automaton.iter(sequence.decode('latin-1')):
+        for index, strand in site_owners:
+            starts[index][strand].append(end - length + 1)
+    matches = []
+    for length, (forward_starts, reverse_starts) in zip(lengths, starts):
+        matches += sites_from_starts(sequence, length, forward_starts, reverse_starts)
+    return matches
+
+def find_each_consensus_matches(sequence, matchers):
+    """
+    Find the matches of several consensus sequences by running each matcher in turn.
+    """
+    return [site for find_matches in matchers for site in find_matches(sequence)]
+
+def build_multi_matcher(consensi):
+    """
+    Build a function that returns the TFBS of several consensus sequences on both strands.
+
+    A single consensus uses build_matcher. Several are scanned together with an
+    Aho-Corasick automaton when pyahocorasick is installed and their explicit
+    sites number at most MAX_EXPANDED_SITES; otherwise each consensus is
+    scanned in turn. Either way, results are grouped by consensus in input order.
+
+    Args:
+        consensi (list): Consensus sequences in IUPAC notation.
+
+    Returns:
+        callable: Function taking a sequence (bytes) and returning a list of matched TFBS sequences.
+    """
+    if len(consensi) == 1:
+        return build_matcher(consensi[0])
+    if ahocorasick is not None:
+        site_count = 2 * sum(count_expanded_sites(consensus) for consensus in consensi)
+        if site_count <= MAX_EXPANDED_SITES:
+            automaton = build_aho_corasick_automaton(consensi)
+            lengths = [len(consensus) for consensus in consensi]
+            return partial(find_aho_corasick_matches, automaton=automaton, lengths=lengths)
+        logging.info(f"{site_count} explicit sites exceed {MAX_EXPANDED_SITES}; scanning each consensus separately.")
+    matchers = [build_matcher(consensus) for consensus in consensi]
+    return partial(find_each_consensus_matches, matchers=matchers)
+
+def read_consensus_file(consensus_file):
+    """
+    Read IUPAC consensus sequences from a file, one per line.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        consensus_file (str): Path to the consensus file.
+
+    Returns:
+        list: List of consensus sequences.
+
+    Raises:
+        ValueError: If the file contains no consensus sequences.
+    """
+    try:
+        with open(consensus_file, 'r') as file:
+            consensi = [line.strip() for line in file]
+    except FileNotFoundError:
+        logging.error(f"File {consensus_file} not found.")
+        raise
+    consensi = [consensus for consensus in consensi if consensus and not consensus.startswith('#')]
+    if not consensi:
+        logging.error(f"No consensus sequences found in {consensus_file}.")
+        raise ValueError(f"No consensus sequences found in {consensus_file}.")
+    return consensi
+
+# Matcher used by a worker process, set once by _init_worker
+_worker_find_matches = None
+
+def _init_worker(consensi):
+    """
+    Build the matcher in a worker process so it is not pickled with every task.
+    """
+    global _worker_find_matches
+    _worker_find_matches = build_multi_matcher(consensi)
+
+def _scan_records(records):
+    """
+    Scan a batch of (name, sequence) records in a worker process.
+    """
+    return [(seq_id, _worker_find_matches(seq)) for seq_id, seq in records]
+
+def iter_scanned_records(records, consensi, workers):
+    """
+    Scan FASTA records in a pool of worker processes.
+
+    Records are submitted in batches of SCAN_BATCH_SIZE with at most two
+    batches per worker in flight, so memory use stays bounded while the input
+    is streamed.
+
+    Args:
+        records (iterable): (name, sequence) records, e.g. from iter_fasta.
+        consensi (list): Consensus sequences in IUPAC notation.
+        workers (int): Number of worker processes.
+
+    Yields:
+        tuple: (name, matches) for each record, in input order.
+    """
+    records = iter(records)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(consensi,)) as executor:
+        pending = deque()
+        while batch := list(islice(records, SCAN_BATCH_SIZE)):
+            pending.append(executor.submit(_scan_records, batch))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def process_fasta_file(input_fasta, consensus, output_file, delimiter, workers=1):
     """
     Process a FASTA file to find transcription factor binding sites (TFBS).
 
     Args:
         input_fasta (str): Path to the input FASTA file.
-        consensus (str): Consensus sequence in IUPAC notation.
+        consensus (str or list): Consensus sequence in IUPAC notation, or a list of them.
         output_file (str): Path to the output file.
         delimiter (str): Delimiter for the output file (e.g., tab or comma).
+        workers (int): Number of processes used to scan sequences (default: 1).
     """
     logging.info(f"Processing FASTA file: {input_fasta}")
-    regex_pattern = build_regex_from_consensus(consensus)
-    try:
-        sequences = parse_fasta(input_fasta)
-    except Exception as e:
-        logging.error(f"Failed to parse FASTA file: {e}")
-        raise
-    
-    with open(output_file, 'w') as output:
-        # Write header to the output file
-        header = f"Sequence_ID{delimiter}TFBS\n"
-        output.write(header)
-        
-        for seq_id, seq in sequences.items():
-            rev_comp = str(Seq(seq).reverse_complement())  # Reverse complement
-            matches = find_overlapping_matches(seq, regex_pattern)
-            matches += find_overlapping_matches(rev_comp, regex_pattern)
-            
-            tfbs_results = delimiter.join(matches) if matches else "None"
-            output.write(f"{seq_id}{delimiter}{tfbs_results}\n")
-    
+    if workers < 1:
+        logging.error(f"Invalid number of workers: {workers}")
+        raise ValueError(f"Invalid number of workers: {workers}")
+    consensi = [consensus] if isinstance(consensus, str) else list(consensus)
+    if workers > 1:
+        # Workers build their own matcher; only validate here rather than
+        # building (e.g. a large Aho-Corasick automaton) an extra time
+        for motif in consensi:
+            validate_consensus(motif)
+    else:
+        find_matches = build_multi_matcher(consensi)
+
+    # Read the first record before creating the output, so a missing or
+    # malformed input fails without leaving a results file behind
+    records = iter_fasta(input_fasta)
+    first_record = next(records, None)
+    if first_record is not None:
+        records = chain([first_record], records)
+
+    with open(output_file, 'w', buffering=WRITE_BUFFER_SIZE) as output:
+        try:
+            # Write header to the output file
+            header = f"Sequence_ID{delimiter}TFBS\n"
+            output.write(header)
+
+            # Records are streamed from the file and written as they are scanned
+            if workers > 1:
+                scanned = iter_scanned_records(records, consensi, workers)
+            else:
+                scanned = ((seq_id, find_matches(seq)) for seq_id, seq in records)
+
+            # Bind hot-loop methods to locals to skip attribute lookups per record
+            join = delimiter.encode().join
+            write = output.write
+            for seq_id, matches in scanned:
+                tfbs_results = join(matches).decode() if matches else "None"
+                write(f"{seq_id}{delimiter}{tfbs_results}\n")
+        except BaseException:
+            # Do not leave truncated results behind for part2 to analyze,
+            # including when a long run is interrupted with Ctrl-C
+            try:
+                output.close()
+            finally:
+                os.remove(output_file)
+            raise
+
     logging.info(f"Results written to {output_file}")
 
+def positive_int(value):
+    """
+    Argparse type accepting integers of at least 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
 def main():
     """
     Main function to parse arguments and process the input FASTA file.
     """
     print(ASCII_ART)
     parser = argparse.ArgumentParser(
-        usage="python3 part1.py input_fasta consensus [--output_file OUTPUT_FILE] [--delimiter {tab,comma}]",
+        usage="python3 part1.py input_fasta [consensus] [--consensus_file CONSENSUS_FILE] [--output_file OUTPUT_FILE] [--delimiter {tab,comma}] [--workers WORKERS]",
         epilog="Example: python script.py input.fasta GGGRNWYYCC --output_file results.txt --delimiter comma"
     )
     parser.add_argument("input_fasta", help="Input FASTA file with DNA sequences.")
-    parser.add_argument("consensus", help="Consensus sequence in IUPAC notation.")
+    parser.add_argument("consensus", nargs="?", help="Consensus sequence in IUPAC notation.")
+    parser.add_argument(
+        "--consensus_file",
+        help="File with one IUPAC consensus sequence per line, scanned instead of a single consensus."
+    )
     parser.add_argument(
         "--output_file",
         default="tfbs_results.txt",
@@ -160,13 +747,21 @@ def main():
         default="tab",
         help="Delimiter for the output file (default: tab)."
     )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="Number of processes used to scan sequences (default: 1)."
+    )
     
     args = parser.parse_args()
+    if (args.consensus is None) == (args.consensus_file is None):
+        parser.error("provide either a consensus sequence or --consensus_file")
 
     try:
-        validate_consensus(args.consensus)
+        consensus = read_consensus_file(args.consensus_file) if args.consensus_file else args.consensus
         delimiter = "\t" if args.delimiter == "tab" else ","
-        process_fasta_file(args.input_fasta, args.consensus, args.output_file, delimiter)
+        process_fasta_file(args.input_fasta, consensus, args.output_file, delimiter, args.workers)
     except ValueError as e:
         logging.error(f"Error: {e}")
 
@@ -2,57 +2,80 @@ import argparse
 from collections import Counter
 import os
 import logging
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Read TFBS results in 1 MiB blocks rather than the 8 KiB default
+READ_BUFFER_SIZE = 1 << 20
+
+# np.bincount widens its input to intp, so long sequences are counted in blocks
+COUNT_BLOCK_SIZE = 1 << 22
+
 
 def count_nucleotides(sequence):
     """
-    Count the occurrences of each nucleotide in a sequence.
+    Count the occurrences of each nucleotide in a sequence (str or bytes).
+
+    All four counts come from a single np.bincount pass over the bytes.
     """
     if not sequence:
         logging.warning("Empty sequence received.")
         return {}
 
     try:
-        counts = {nucleotide: sequence.count(nucleotide) for nucleotide in "ACGT"}
-        logging.info(f"Nucleotide counts for sequence: {counts}")
+        if isinstance(sequence, str):
+            # Non-ASCII characters become "?" and are not counted, like any other non-ACGT character
+            sequence = sequence.encode("ascii", "replace")
+        data = np.frombuffer(sequence, dtype=np.uint8)
+        totals = np.zeros(256, dtype=np.int64)
+        for start in range(0, len(data), COUNT_BLOCK_SIZE):
+            totals += np.bincount(data[start:start + COUNT_BLOCK_SIZE], minlength=256)
+        counts = {nucleotide: int(totals[ord(nucleotide)]) for nucleotide in "ACGT"}
+        # Lazy formatting: nothing is formatted when INFO is filtered out
+        logging.info("Nucleotide counts for sequence: %s", counts)
         return counts
     except Exception as e:
         logging.error(f"Error while counting nucleotides: {e}")
         raise
 
 
+def iter_tfbs(lines):
+    """
+    Yield each TFBS listed in Part 1 result lines (header already skipped).
+
+    Lines are bytes and TFBS are yielded as bytes, so the file never needs
+    decoding. Yields None once for every sequence without matches, so a single
+    Counter over this generator also counts those sequences.
+    """
+    for line in lines:
+        _, tab, tfbs = line.rstrip(b"\r\n").partition(b"\t")
+        if not tab:
+            line = line.decode(errors="replace")
+            logging.error(f"Invalid line format: {line}")
+            raise ValueError(f"Invalid line format: {line}")
+
+        if tfbs == b"None":
+            yield None
+        elif b"," in tfbs:
+            # Comma-separated TFBS lists are accepted as well as Part 1's tabs
+            yield from tfbs.replace(b"\t", b",").split(b",")
+        else:
+            yield from tfbs.split(b"\t")
+
+
 def analyze_tfbs_output(input_file):
     """Analyze TFBS output to find top sequences and count sequences without matches."""
     logging.info(f"Analyzing TFBS results from file: {input_file}")
-    tfbs_counts = Counter()
-    no_tfbs_count = 0
 
     try:
-        with open(input_file, "r") as file:
+        with open(input_file, "rb", buffering=READ_BUFFER_SIZE) as file:
             next(file)  # Skip header
-            for line in file:
-                fields = line.strip().split("\t")
-                if len(fields) < 2:
-                    logging.error(f"Invalid line format: {line}")
-                    raise ValueError(f"Invalid line format: {line}")
-
-                sequence_id, *tfbs_fields = fields  # Capture extra TFBS values
-                tfbs = ",".join(
-                    tfbs_fields
-                )  # Combine multiple TFBS fields into one string
-
-                if tfbs == "None":
-                    no_tfbs_count += 1
-                else:
-                    tfbs_list = tfbs.split(",")
-                    tfbs_counts.update(tfbs_list)
+            tfbs_counts = Counter(iter_tfbs(file))
+        no_tfbs_count = tfbs_counts.pop(None, 0)
     except FileNotFoundError:
         logging.error(f"File {input_file} not found.")
         raise
@@ -60,12 +83,13 @@ def analyze_tfbs_output(input_file):
         logging.error(f"Error while analyzing TFBS output: {e}")
         raise
 
+    # Get top 10 most common TFBS sequences, decoded only now for display
+    top_tfbs = [(tfbs.decode(), count) for tfbs, count in tfbs_counts.most_common(10)]
+
     # Log results
     logging.info(f"Total sequences without matches: {no_tfbs_count}")
-    logging.info(f"Top 10 TFBS counts: {tfbs_counts.most_common(10)}")
+    logging.info(f"Top 10 TFBS counts: {top_tfbs}")
 
-    # Get top 10 most common TFBS sequences
-    top_tfbs = tfbs_counts.most_common(10)
     return top_tfbs, no_tfbs_count
 
 
@@ -75,6 +99,13 @@ def plot_top_tfbs(top_tfbs, output_file):
         logging.warning("No TFBS data to plot.")
         return
 
+    # Plotting libraries are slow to import, so load them only when plotting
+    import matplotlib
+
+    matplotlib.use("Agg")  # Non-interactive backend; skips GUI toolkit probing
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     sequences, counts = zip(
         *top_tfbs
     )  # Unpack the top TFBS into sequences and their counts
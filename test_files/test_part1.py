@@ -1,11 +1,30 @@
+import io
 import os
 import unittest
+from unittest.mock import patch
 import logging
 from part1 import (
+    hyperscan,
+    ShiftAndScanner,
+    BASE_MASKS,
     validate_consensus,
     build_regex_from_consensus,
+    build_stranded_regex,
+    find_stranded_matches,
+    build_hyperscan_database,
+    find_hyperscan_matches,
+    consensus_to_masks,
+    find_bitmask_matches,
+    find_shift_and_matches,
     process_fasta_file,
+    expand_consensus,
+    build_matcher,
+    build_multi_matcher,
+    read_consensus_file,
     parse_fasta,
+    iter_fasta,
+    _iter_line_records,
+    reverse_complement,
 )
 
 # Configure logging for tests
@@ -61,8 +80,62 @@ class TestPart1(unittest.TestCase):
     def test_build_regex_from_consensus(self):
         logging.info("Testing build_regex_from_consensus...")
         regex = build_regex_from_consensus(self.test_consensus)
-        self.assertTrue(regex.match("GGGAAATTCC"))
-        self.assertFalse(regex.match("TTTCCGGGAA"))
+        self.assertTrue(regex.match(b"GGGAAATTCC"))
+        self.assertFalse(regex.match(b"TTTCCGGGAA"))
+
+    def test_reverse_complement(self):
+        logging.info("Testing reverse_complement...")
+        self.assertEqual(reverse_complement(b"ATGGTTCC"), b"GGAACCAT")
+        self.assertEqual(reverse_complement(b"GGGRNWYYCC"), b"GGRRWNYCCC")
+        self.assertEqual(reverse_complement(b"acgtN"), b"Nacgt")
+
+    def test_find_stranded_matches(self):
+        logging.info("Testing find_stranded_matches...")
+        pattern = build_stranded_regex(self.test_consensus)
+        # Forward site, then a reverse-strand site reported as read on that strand
+        matches = find_stranded_matches(b"GGGAAATTCCAAGGAATTTCCC", pattern)
+        self.assertEqual(matches, [b"GGGAAATTCC", b"GGGAAATTCC"])
+        # A palindromic site is reported once per strand
+        palindrome = build_stranded_regex("GATC")
+        self.assertEqual(find_stranded_matches(b"AGATCA", palindrome), [b"GATC", b"GATC"])
+
+    def test_find_bitmask_matches(self):
+        logging.info("Testing find_bitmask_matches...")
+        # Includes N and lowercase bases, which never match
+        sequence = b"GGGAAATTCCAAGGAATTTCCCGGGNAATTCCgggaaattccGGGGAATTCC"
+        forward_masks = consensus_to_masks(self.test_consensus)
+        reverse_masks = consensus_to_masks("GGRRWNYCCC")
+        self.assertEqual(
+            find_bitmask_matches(sequence, forward_masks, reverse_masks),
+            find_stranded_matches(sequence, build_stranded_regex(self.test_consensus)),
+        )
+        self.assertEqual(find_bitmask_matches(b"GGG", forward_masks, reverse_masks), [])
+
+    @unittest.skipIf(ShiftAndScanner is None, "the _scan extension is not built")
+    def test_find_shift_and_matches(self):
+        logging.info("Testing find_shift_and_matches...")
+        sequence = b"GGGAAATTCCAAGGAATTTCCCGGGNAATTCCgggaaattccGGGGAATTCC"
+        forward_masks = consensus_to_masks(self.test_consensus)
+        reverse_masks = consensus_to_masks("GGRRWNYCCC")
+        scanner = ShiftAndScanner(BASE_MASKS, forward_masks, reverse_masks)
+        self.assertEqual(
+            find_shift_and_matches(sequence, scanner),
+            find_stranded_matches(sequence, build_stranded_regex(self.test_consensus)),
+        )
+        self.assertEqual(find_shift_and_matches(b"", scanner), [])
+        empty_masks = consensus_to_masks("")
+        with self.assertRaises(ValueError):
+            ShiftAndScanner(BASE_MASKS, empty_masks, empty_masks)
+
+    @unittest.skipIf(hyperscan is None, "hyperscan is not installed")
+    def test_find_hyperscan_matches(self):
+        logging.info("Testing find_hyperscan_matches...")
+        sequence = b"GGGAAATTCCAAGGAATTTCCCGGGGAATTCC"
+        database = build_hyperscan_database(self.test_consensus)
+        self.assertEqual(
+            find_hyperscan_matches(sequence, database, len(self.test_consensus)),
+            find_stranded_matches(sequence, build_stranded_regex(self.test_consensus)),
+        )
 
     def test_process_fasta_file(self):
         logging.info("Testing process_fasta_file...")
@@ -75,12 +148,116 @@ class TestPart1(unittest.TestCase):
             self.assertIn("seq2\tGGGGAATTCC\n", lines)
             self.assertIn("seq3\tNone\n", lines)
 
+    def test_process_fasta_file_workers(self):
+        logging.info("Testing process_fasta_file with worker processes...")
+        process_fasta_file(self.test_fasta, self.test_consensus, self.output_file, "\t")
+        with open(self.output_file, "r") as f:
+            expected = f.read()
+        process_fasta_file(self.test_fasta, self.test_consensus, self.output_file, "\t", workers=2)
+        with open(self.output_file, "r") as f:
+            self.assertEqual(f.read(), expected)
+
+    def test_expand_consensus(self):
+        logging.info("Testing expand_consensus...")
+        self.assertEqual(expand_consensus("RAY"), ["AAC", "AAT", "GAC", "GAT"])
+        self.assertEqual(len(expand_consensus(self.test_consensus)), 64)
+
+    def test_build_multi_matcher(self):
+        logging.info("Testing build_multi_matcher...")
+        sequence = b"GGGAAATTCCAAGGAATTTCCCGATCGGGGAATTCC"
+        find_matches = build_multi_matcher([self.test_consensus, "GATC"])
+        # Results are grouped by consensus in input order
+        self.assertEqual(
+            find_matches(sequence),
+            build_matcher(self.test_consensus)(sequence) + build_matcher("GATC")(sequence),
+        )
+
+    def test_process_fasta_file_multiple_consensi(self):
+        logging.info("Testing process_fasta_file with a consensus file...")
+        consensus_file = "test_consensi.txt"
+        with open(consensus_file, "w") as f:
+            f.write("# RelA and a palindrome\nGGGRNWYYCC\n\nATGG\n")
+        try:
+            consensi = read_consensus_file(consensus_file)
+        finally:
+            os.remove(consensus_file)
+        self.assertEqual(consensi, ["GGGRNWYYCC", "ATGG"])
+        process_fasta_file(self.test_fasta, consensi, self.output_file, "\t")
+        with open(self.output_file, "r") as f:
+            lines = f.readlines()
+            self.assertIn("seq1\tGGGAAATTCC\tGGGAAATTCC\tATGG\n", lines)
+            self.assertIn("seq3\tATGG\n", lines)
+
+    def test_process_fasta_file_malformed_leaves_no_output(self):
+        logging.info("Testing process_fasta_file removes output on malformed FASTA...")
+        with self.assertRaises(ValueError):
+            process_fasta_file(self.malformed_fasta, self.test_consensus, self.output_file, "\t")
+        self.assertFalse(os.path.exists(self.output_file))
+
+        # A bad record after a valid one is only found while results are written
+        with open(self.malformed_fasta, "wb") as f:
+            f.write(b">seq1\nGGGAAATTCC\n>seq2\xff\nACGT\n")
+        with self.assertRaises(UnicodeDecodeError):
+            process_fasta_file(self.malformed_fasta, self.test_consensus, self.output_file, "\t")
+        self.assertFalse(os.path.exists(self.output_file))
+
+    def test_process_fasta_file_invalid_workers(self):
+        logging.info("Testing process_fasta_file rejects invalid worker counts...")
+        with self.assertRaises(ValueError):
+            process_fasta_file(self.test_fasta, self.test_consensus, self.output_file, "\t", workers=0)
+        with self.assertRaises(ValueError):
+            process_fasta_file(self.test_fasta, "GGGZ", self.output_file, "\t", workers=2)
+        self.assertFalse(os.path.exists(self.output_file))
+
+    def test_process_fasta_file_unopenable_output_is_kept(self):
+        logging.info("Testing process_fasta_file keeps an existing output it cannot open...")
+        with open(self.output_file, "w") as f:
+            f.write("previous results\n")
+        real_open = open
+
+        def deny_output(path, *args, **kwargs):
+            if path == self.output_file:
+                raise PermissionError(f"Permission denied: '{path}'")
+            return real_open(path, *args, **kwargs)
+
+        with patch("builtins.open", side_effect=deny_output):
+            with self.assertRaises(PermissionError):
+                process_fasta_file(self.test_fasta, self.test_consensus, self.output_file, "\t")
+        with open(self.output_file, "r") as f:
+            self.assertEqual(f.read(), "previous results\n")
+
+    def test_process_fasta_file_interrupt_removes_output(self):
+        logging.info("Testing process_fasta_file removes partial output on KeyboardInterrupt...")
+        def interrupt(sequence):
+            raise KeyboardInterrupt
+
+        with patch("part1.build_multi_matcher", return_value=interrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                process_fasta_file(self.test_fasta, self.test_consensus, self.output_file, "\t")
+        self.assertFalse(os.path.exists(self.output_file))
+
     def test_parse_fasta_valid(self):
         logging.info("Testing parse_fasta with valid FASTA...")
         sequences = parse_fasta(self.test_fasta)
         self.assertEqual(len(sequences), 3)
         self.assertIn("seq1", sequences)
-        self.assertEqual(sequences["seq1"], "ATGGGAAATTCCGGGAAATTCC")
+        self.assertEqual(sequences["seq1"], b"ATGGGAAATTCCGGGAAATTCC")
+
+    def test_iter_fasta(self):
+        logging.info("Testing iter_fasta yields records in file order...")
+        records = iter_fasta(self.test_fasta)
+        self.assertEqual(next(records), ("seq1", b"ATGGGAAATTCCGGGAAATTCC"))
+        self.assertEqual([name for name, _ in records], ["seq2", "seq3"])
+
+    def test_iter_line_records(self):
+        logging.info("Testing the line-based FASTA reader used for pipes...")
+        stream = io.BytesIO(b">seq1 desc\r\nACGT\r\nTTGG\r\n>seq2\n\nCC\nGG\n>seq3")
+        self.assertEqual(
+            list(_iter_line_records(stream)),
+            [("seq1 desc", b"ACGTTTGG"), ("seq2", b"CCGG"), ("seq3", b"")],
+        )
+        with self.assertRaises(ValueError):
+            list(_iter_line_records(io.BytesIO(b"ACGT\n>seq1\nACGT\n")))
 
     def test_parse_fasta_empty(self):
         logging.info("Testing parse_fasta with empty FASTA...")
@@ -3,7 +3,7 @@ from unittest.mock import patch, mock_open
 import os
 from collections import Counter
 import tempfile
-from part2 import analyze_tfbs_output, plot_top_tfbs, save_summary_to_file, count_nucleotides
+from part2 import analyze_tfbs_output, iter_tfbs, plot_top_tfbs, save_summary_to_file, count_nucleotides
 
 class TestPart2(unittest.TestCase):
 
@@ -40,6 +40,16 @@ class TestPart2(unittest.TestCase):
         # Check no TFBS count
         self.assertEqual(no_tfbs_count, 2)
 
+    def test_iter_tfbs(self):
+        """Test the iter_tfbs generator."""
+        lines = [b"seq1\tGGGAAATTCC\tGGGGAATTCC\n", b"seq2\tNone\n", b"seq3\tGGGAAATTCC,GGGGAATTCC\n"]
+        self.assertEqual(
+            list(iter_tfbs(lines)),
+            [b"GGGAAATTCC", b"GGGGAATTCC", None, b"GGGAAATTCC", b"GGGGAATTCC"],
+        )
+        with self.assertRaises(ValueError):
+            list(iter_tfbs([b"seq1 GGGAAATTCC\n"]))
+
     def test_plot_top_tfbs(self):
         """Test the plot_top_tfbs function."""
         top_tfbs = [("GGGAAATTCC", 5), ("GGGGAATTCC", 3)]
@@ -87,6 +97,11 @@ class TestPart2(unittest.TestCase):
         result = count_nucleotides(sequence)
         self.assertEqual(result, {'A': 1000000, 'C': 1000000, 'G': 1000000, 'T': 1000000})
 
+    def test_count_nucleotides_bytes_sequence(self):
+        """Test count_nucleotides with a bytes sequence as produced by part1."""
+        result = count_nucleotides(b'ATCGATCGAA')
+        self.assertEqual(result, {'A': 4, 'C': 2, 'G': 2, 'T': 2})
+
     def test_count_nucleotides_invalid_characters(self):
         """Test count_nucleotides with invalid characters."""
         result = count_nucleotides('ATCGXYZ')